@@ -6,172 +6,821 @@
 # - Matches by NAME across servers (IDs differ). Overwrites attempt ID-first then fall back to ROLE NAME
 #   using the snapshot's roles list (id->name).
 # - v1 creates/updates roles, categories, channels, and overwrites. Now includes safe role deletion.
-# - Stores snapshots in /data/mihsef_snapshots (good for Dockerized Red).
+# - Stores snapshots in /data/mihsef_snapshots (good for Dockerized Red) as gzip-compressed compact JSON
+#   (.json.gz); the uploaded copy is indented for readability.
+# - Overwrites are keyed "r<id>"/"u<id>" and stored as {"allow": <int>, "deny": <int>} bitfields (schema 3);
+#   `!mihsef snapshot True` writes the older "role:<id>"/named-permission layout (schema 1).
+#   Every schema version can be applied.
 
 import asyncio
 import datetime
+import functools
+import gzip
+import io
 import json
+import os
+import time
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    Awaitable, BinaryIO, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple,
+)
 
 import discord
 from redbot.core import commands, checks
 from redbot.core.bot import Red
 import logging
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
 logger = logging.getLogger("red.mihsef")
 
 CHECK_MARK = "✅"
 CROSS_MARK = "❌"
+_REACTIONS: FrozenSet[str] = frozenset((CHECK_MARK, CROSS_MARK))
+
+# meta.schema_version written by `snapshot`:
+#   1 -> overwrites keyed "role:<id>"/"member:<id>", as {permission_name: True/False}
+#   3 -> overwrites keyed "r<id>"/"u<id>", as {"allow": <int>, "deny": <int>} (PermissionOverwrite.pair() values)
+SCHEMA_NAMED = 1
+SCHEMA_SHORT_KEYS = 3
+
+# Overwrite key prefixes (any schema) -> subject type.
+_OVERWRITE_KEY_TYPES = {"role": "role", "member": "member", "r": "role", "u": "member"}
+
+# Write buffer for snapshot files: coalesces the many small gzip writes into a few syscalls.
+SNAPSHOT_WRITE_BUFFER = 1 << 20
+
+# Largest decompressed .json.gz snapshot update_from_json accepts (guards against gzip bombs).
+MAX_SNAPSHOT_BYTES = 64 << 20
+
+# Max concurrent Discord API calls per apply phase. discord.py still waits on each rate-limit
+# bucket; this only lets independent requests overlap instead of running back to back.
+APPLY_CONCURRENCY = 5
+
+_CATEGORY_TYPE = discord.ChannelType.category
+# Media channels are ForumChannel objects with their own ChannelType (newer discord.py only).
+_MEDIA_TYPE = getattr(discord.ChannelType, "media", None)
+# Live channel types update_from_json matches by name (TextChannel covers text + news,
+# ForumChannel covers forum + media).
+_APPLY_CHANNEL_TYPES: FrozenSet[discord.ChannelType] = frozenset(
+    t for t in (
+        discord.ChannelType.text,
+        discord.ChannelType.news,
+        discord.ChannelType.voice,
+        discord.ChannelType.forum,
+        _MEDIA_TYPE,
+    )
+    if t is not None
+)
+
+# Permission name -> bit, for composing allow/deny masks from the named (schema 1) layout.
+_PERM_BITS: Dict[str, int] = dict(discord.Permissions.VALID_FLAGS)
+
+# Attribute batches read by the snapshot record builders (one C-level call per object).
+_ROLE_FIELDS = attrgetter("id", "name", "position", "color", "hoist", "mentionable", "managed", "permissions")
+_CHANNEL_FIELDS = attrgetter("id", "name", "type", "position", "category_id", "overwrites")
+
+# Complete list of known permission attributes (compatible with Discord.py 1.x and 2.x)
+_PERM_ATTRS: Tuple[str, ...] = (
+    "create_instant_invite", "kick_members", "ban_members", "administrator",
+    "manage_channels", "manage_guild", "add_reactions", "view_audit_log",
+    "priority_speaker", "stream", "read_messages", "view_channel",
+    "send_messages", "send_tts_messages", "manage_messages", "embed_links",
+    "attach_files", "read_message_history", "mention_everyone",
+    "use_external_emojis", "external_emojis", "view_guild_insights",
+    "connect", "speak", "mute_members", "deafen_members",
+    "move_members", "use_voice_activation", "change_nickname",
+    "manage_nicknames", "manage_roles", "manage_webhooks",
+    "manage_emojis", "use_slash_commands", "use_application_commands",
+    "request_to_speak", "manage_events", "manage_threads",
+    "create_public_threads", "use_public_threads", "create_private_threads",
+    "use_private_threads", "use_external_stickers", "external_stickers",
+    "send_messages_in_threads", "use_embedded_activities", "moderate_members",
+    "create_events", "send_polls", "use_external_apps", "use_external_sounds",
+    "use_soundboard", "send_voice_messages",
+)
 
 # ------------ helpers (mapping & utilities) ------------
 
+def _dumps_json(data, pretty: bool = True) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes, indented if `pretty`, otherwise compact.
+    Uses orjson (C) when installed, otherwise the stdlib encoder.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _loads_json(raw: bytes):
+    """
+    Parse UTF-8 JSON bytes (orjson when installed, otherwise the stdlib parser).
+    Both accept bytes directly, so no intermediate decoded str is built.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _gunzip_capped(raw: bytes, limit: int = MAX_SNAPSHOT_BYTES) -> bytes:
+    """
+    Decompress gzip `raw`, reading at most `limit` + 1 bytes; raises ValueError if the
+    payload expands beyond `limit`. Blocking; meant to run in an executor.
+    """
+    with gzip.GzipFile(fileobj=io.BytesIO(raw)) as gz:
+        data = gz.read(limit + 1)
+    if len(data) > limit:
+        raise ValueError(f"decompressed snapshot exceeds {limit >> 20} MiB")
+    return data
+
+
+def _iter_snapshot_json(sections: Iterable[Tuple[str, object]], pretty: bool = True) -> Iterator[bytes]:
+    """
+    Incrementally encode a JSON object from (key, value) `sections`.
+    Dict values are encoded whole; any other value is a list of records, encoded one record
+    at a time so the encoded document is never held in memory (the records themselves are).
+    The concatenated output matches _dumps_json() of the equivalent dict.
+    """
+    # JSON encoders never emit a raw newline inside strings, so re-indenting
+    # nested output is a plain newline substitution.
+    key_indent = b"\n  " if pretty else b""
+    item_indent = b"\n    " if pretty else b""
+    colon = b": " if pretty else b":"
+
+    yield b"{"
+    for i, (key, value) in enumerate(sections):
+        yield (b"," if i else b"") + key_indent + _dumps_json(key, pretty) + colon
+        if isinstance(value, dict):
+            chunk = _dumps_json(value, pretty)
+            yield chunk.replace(b"\n", key_indent) if pretty else chunk
+            continue
+        yield b"["
+        count = 0
+        for count, item in enumerate(value, 1):
+            chunk = _dumps_json(item, pretty)
+            if pretty:
+                chunk = chunk.replace(b"\n", item_indent)
+            yield (b"," if count > 1 else b"") + item_indent + chunk
+        yield (key_indent if count else b"") + b"]"
+    yield (b"\n" if pretty else b"") + b"}"
+
+
+def _fsync_dir(path: Path) -> None:
+    """Best-effort fsync of a directory so renames inside it are durable (no-op where unsupported)."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _flush_snapshots(entries: List[Tuple[Path, Callable[[BinaryIO], object]]]) -> None:
+    """
+    Atomically write several snapshot files as one group commit.
+    `entries` are (path, write) pairs; `write` receives an open binary temp file
+    (<name>.tmp, with a 1 MiB buffer) and fills it. Each temp file is fsynced, then all
+    of them are renamed over their final paths and every parent directory is fsynced
+    once, rather than once per file. A crash never leaves a truncated snapshot behind.
+    Blocking; meant to run in an executor.
+    """
+    tmps: List[Path] = []
+    try:
+        for path, write in entries:
+            tmp = path.with_name(path.name + ".tmp")
+            tmps.append(tmp)
+            with open(tmp, "wb", buffering=SNAPSHOT_WRITE_BUFFER) as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+        for (path, _), tmp in zip(entries, tmps):
+            os.replace(tmp, path)
+    except BaseException:
+        for tmp in tmps:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        raise
+    for directory in {path.parent for path, _ in entries}:
+        _fsync_dir(directory)
+
+
+def _write_snapshot(path: Path, sections: List[Tuple[str, object]], ensure_dir: bool = True) -> bytes:
+    """
+    Encode `sections` (see _iter_snapshot_json) in a single pass into two gzip streams:
+    compact JSON, written straight to `path` via _flush_snapshots (creating the parent
+    directory first if `ensure_dir`), and indented JSON for the human-facing upload, which
+    is returned. The records are built up front on the event loop; only their encoding is
+    streamed, so neither encoded document is held in memory, only the compressed upload.
+    Blocking; meant to run in an executor.
+    """
+    upload_buf = io.BytesIO()
+
+    def write(f: BinaryIO) -> None:
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=3) as disk_gz, \
+                gzip.GzipFile(fileobj=upload_buf, mode="wb", compresslevel=3) as upload_gz:
+            for compact, pretty in zip(
+                _iter_snapshot_json(sections, pretty=False),
+                _iter_snapshot_json(sections, pretty=True),
+            ):
+                disk_gz.write(compact)
+                upload_gz.write(pretty)
+
+    if ensure_dir:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    _flush_snapshots([(path, write)])
+    return upload_buf.getvalue()
+
+
 def _overwrite_to_dict(perms: discord.PermissionOverwrite) -> Dict[str, bool]:
     """
     Convert a PermissionOverwrite to a dict of {permission_name: True/False},
     skipping entries that are None.
     """
+    return {attr: value for attr in _PERM_ATTRS if (value := getattr(perms, attr, None)) is not None}
+
+
+@functools.lru_cache(maxsize=512)
+def _overwrite_pair_to_items(allow: int, deny: int) -> Tuple[Tuple[str, bool], ...]:
+    """
+    Named (permission_name, True/False) items for an overwrite's (allow, deny) bitfields.
+    Cached process-wide (overwrite patterns repeat across channels and snapshots);
+    returns an immutable tuple so cached values cannot be mutated by callers.
+    """
+    po = discord.PermissionOverwrite.from_pair(discord.Permissions(allow), discord.Permissions(deny))
+    return tuple(_overwrite_to_dict(po).items())
+
+
+def _overwrite_to_json_cached(
+    perms: discord.PermissionOverwrite,
+    cache: Dict[Tuple[int, int], dict],
+    named: bool = False,
+) -> dict:
+    """
+    Serialize an overwrite (bitfields, or named permissions if `named`), memoized on its
+    (allow, deny) bitfields. Most channels share a handful of overwrite patterns, so each
+    one is converted once. Use one cache per snapshot and layout; the returned dict is shared
+    between callers and must not be mutated.
+    """
+    allow, deny = perms.pair()
+    key = (allow.value, deny.value)
+    out = cache.get(key)
+    if out is None:
+        if named:
+            out = dict(_overwrite_pair_to_items(*key))
+        else:
+            out = {"allow": key[0], "deny": key[1]}
+        cache[key] = out
+    return out
+
+
+def _overwrite_from_json(perms_json: Optional[dict]) -> discord.PermissionOverwrite:
+    """
+    Build a PermissionOverwrite from either snapshot layout:
+    {"allow": int, "deny": int} bitfields (schema 3) or {permission_name: True/False/None} (schema 1).
+    """
+    perms_json = perms_json or {}
+    if set(perms_json) == {"allow", "deny"}:
+        return discord.PermissionOverwrite.from_pair(
+            discord.Permissions(int(perms_json["allow"])),
+            discord.Permissions(int(perms_json["deny"])),
+        )
+    # Compose both masks from the named layout and build in one from_pair call
+    # rather than a hasattr/setattr per permission.
+    allow = deny = 0
+    for attr, val in perms_json.items():
+        bit = _PERM_BITS.get(attr)
+        if bit is None:
+            continue
+        if val:
+            allow |= bit
+        elif val is False:
+            deny |= bit
+    return discord.PermissionOverwrite.from_pair(discord.Permissions(allow), discord.Permissions(deny))
+
+
+def _overwrite_json_pair(perms_json: Optional[dict]) -> Tuple[int, int]:
+    """(allow, deny) bitfields for a snapshot overwrite in either layout, for comparisons."""
+    allow, deny = _overwrite_from_json(perms_json).pair()
+    return allow.value, deny.value
+
+
+def _overwrite_key(target: discord.abc.Snowflake, named: bool = False) -> str:
+    """Snapshot key for an overwrite target: "r<id>"/"u<id>", or "role:<id>"/"member:<id>" if `named`."""
+    if isinstance(target, discord.Role):
+        return f"role:{target.id}" if named else "r%d" % target.id
+    return f"member:{target.id}" if named else "u%d" % target.id
+
+
+def _split_overwrite_key(key: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a snapshot overwrite key of any schema into (subject_type, raw_id),
+    where subject_type is "role" or "member". Returns None for unrecognised keys.
+    """
+    if ":" in key:
+        prefix, _, raw_id = key.partition(":")
+    else:
+        prefix, raw_id = key[:1], key[1:]
+    subject_type = _OVERWRITE_KEY_TYPES.get(prefix)
+    return (subject_type, raw_id) if subject_type else None
+
+
+def _role_overwrite_sig(
+    overwrites: Dict[discord.abc.Snowflake, discord.PermissionOverwrite],
+) -> FrozenSet[Tuple[int, int, int]]:
+    """
+    Comparable signature of the role entries in an overwrites mapping (a channel's live
+    `.overwrites` or a resolved _perm_overwrites_from_json result): {(role_id, allow, deny), ...}.
+    """
+    sig = []
+    for target, perms in overwrites.items():
+        if isinstance(target, discord.Role):
+            allow, deny = perms.pair()
+            sig.append((target.id, allow.value, deny.value))
+    return frozenset(sig)
+
+
+def _overwrites_in_sync(
+    resolved: Dict[discord.abc.Snowflake, discord.PermissionOverwrite],
+    live: Dict[discord.abc.Snowflake, discord.PermissionOverwrite],
+) -> bool:
+    """
+    True if edit(overwrites=resolved) would leave `live` unchanged. The edit replaces every
+    overwrite, so any live non-role entry (member overwrites are never resolved from a
+    snapshot) counts as a difference, as do differing role entries.
+    """
+    if any(not isinstance(target, discord.Role) for target in live):
+        return False
+    return _role_overwrite_sig(resolved) == _role_overwrite_sig(live)
+
+
+def _snapshot_overwrite_sig(overwrites_json: Optional[Dict[str, dict]]) -> FrozenSet[Tuple[int, int, int]]:
+    """
+    Signature of a snapshot overwrite block, comparable with _role_overwrite_sig.
+    Member keys are left out: member overwrites are never applied.
+    """
+    sig = []
+    for key, perms_json in (overwrites_json or {}).items():
+        split = _split_overwrite_key(key)
+        if split is None or split[0] != "role" or not split[1].isdecimal():
+            continue
+        sig.append((int(split[1]),) + _overwrite_json_pair(perms_json))
+    return frozenset(sig)
+
+
+def _overwrites_to_json(
+    overwrites: Dict[discord.abc.Snowflake, discord.PermissionOverwrite],
+    target_keys: Dict[int, str],
+    cache: Dict[Tuple[int, int], dict],
+    named: bool,
+) -> Dict[str, dict]:
+    """
+    Serialize a channel/category `.overwrites` mapping, keyed by _overwrite_key.
+    `target_keys` maps target id -> key; it is pre-filled with the guild's roles and
+    member keys are added as they are first seen, so each key is formatted once per snapshot.
+    """
     out = {}
-    # Complete list of known permission attributes (compatible with Discord.py 1.x and 2.x)
-    permission_attrs = [
-        "create_instant_invite", "kick_members", "ban_members", "administrator",
-        "manage_channels", "manage_guild", "add_reactions", "view_audit_log",
-        "priority_speaker", "stream", "read_messages", "view_channel",
-        "send_messages", "send_tts_messages", "manage_messages", "embed_links",
-        "attach_files", "read_message_history", "mention_everyone",
-        "use_external_emojis", "external_emojis", "view_guild_insights",
-        "connect", "speak", "mute_members", "deafen_members",
-        "move_members", "use_voice_activation", "change_nickname",
-        "manage_nicknames", "manage_roles", "manage_webhooks",
-        "manage_emojis", "use_slash_commands", "use_application_commands",
-        "request_to_speak", "manage_events", "manage_threads",
-        "create_public_threads", "use_public_threads", "create_private_threads",
-        "use_private_threads", "use_external_stickers", "external_stickers",
-        "send_messages_in_threads", "use_embedded_activities", "moderate_members",
-        "create_events", "send_polls", "use_external_apps", "use_external_sounds",
-        "use_soundboard", "send_voice_messages"
-    ]
-    for attr in permission_attrs:
-        value = getattr(perms, attr, None)
-        if value is not None:
-            out[attr] = value
+    for target, perms in overwrites.items():
+        key = target_keys.get(target.id)
+        if key is None:
+            key = target_keys[target.id] = _overwrite_key(target, named)
+        out[key] = _overwrite_to_json_cached(perms, cache, named=named)
     return out
 
 
+def _role_dict(r: discord.Role) -> dict:
+    """Snapshot record for a role."""
+    rid, name, position, color, hoist, mentionable, managed, permissions = _ROLE_FIELDS(r)
+    return {
+        "id": rid,
+        "name": name,
+        "position": position,
+        "color": color.value,
+        "hoist": hoist,
+        "mentionable": mentionable,
+        "managed": managed,
+        "permissions": permissions.value,
+    }
+
+
+def _category_dict(
+    c: discord.CategoryChannel,
+    target_keys: Dict[int, str],
+    cache: Dict[Tuple[int, int], dict],
+    named: bool,
+) -> dict:
+    """Snapshot record for a category (see _overwrites_to_json for the other arguments)."""
+    return {
+        "id": c.id,
+        "name": c.name,
+        "position": c.position,
+        "nsfw": c.is_nsfw(),
+        "overwrites": _overwrites_to_json(c.overwrites, target_keys, cache, named),
+    }
+
+
+def _voice_props(ch: discord.abc.GuildChannel) -> Tuple[str, Optional[str], bool, int]:
+    """Snapshot (type, topic, nsfw, slowmode_delay) for a voice channel; voice has no text props."""
+    return "voice", None, False, 0
+
+
+def _forum_props(ch: discord.abc.GuildChannel) -> Tuple[str, Optional[str], bool, int]:
+    """Snapshot (type, topic, nsfw, slowmode_delay) for a forum channel."""
+    return "forum", getattr(ch, "topic", None), getattr(ch, "nsfw", False), getattr(ch, "slowmode_delay", 0)
+
+
+def _text_props(ch: discord.abc.GuildChannel) -> Tuple[str, Optional[str], bool, int]:
+    """Snapshot (type, topic, nsfw, slowmode_delay) for a text-like channel."""
+    return "text", getattr(ch, "topic", None), getattr(ch, "nsfw", False), getattr(ch, "slowmode_delay", 0)
+
+
+# Per-ChannelType prop extractors (one hash lookup instead of isinstance/branch chains).
+# Non-category channel types not listed here (news, stage, ...) are recorded as "text".
+_SNAPSHOT_CHANNEL_EXTRACTORS: Dict[discord.ChannelType, Callable[[discord.abc.GuildChannel], tuple]] = {
+    discord.ChannelType.voice: _voice_props,
+    discord.ChannelType.forum: _forum_props,
+    discord.ChannelType.text: _text_props,
+}
+if _MEDIA_TYPE is not None:
+    # Media channels are ForumChannel objects; record them as "forum" like before.
+    _SNAPSHOT_CHANNEL_EXTRACTORS[_MEDIA_TYPE] = _forum_props
+
+
+def _channel_dict(
+    ch: discord.abc.GuildChannel,
+    target_keys: Dict[int, str],
+    cache: Dict[Tuple[int, int], dict],
+    named: bool,
+) -> dict:
+    """Snapshot record for a non-category channel (see _overwrites_to_json for the other arguments)."""
+    cid, name, t, position, parent_id, overwrites = _CHANNEL_FIELDS(ch)
+    ch_type, topic, nsfw, slowmode = _SNAPSHOT_CHANNEL_EXTRACTORS.get(t, _text_props)(ch)
+    return {
+        "id": cid,
+        "name": name,
+        "type": ch_type,
+        "position": position,
+        "parent_id": parent_id,
+        "overwrites": _overwrites_to_json(overwrites, target_keys, cache, named),
+        "nsfw": nsfw,
+        "slowmode_delay": slowmode,
+        "topic": topic,
+    }
+
+
+class SnapRole(NamedTuple):
+    """A snapshot role. Optional fields are None when absent from the JSON ("keep current")."""
+    id: Optional[int]
+    name: str
+    position: Optional[int]
+    color: Optional[int]
+    hoist: Optional[bool]
+    mentionable: Optional[bool]
+    permissions: Optional[int]
+
+
+class SnapCategory(NamedTuple):
+    """A snapshot category."""
+    id: Optional[int]
+    name: str
+    overwrites: Dict[str, dict]
+
+
+class SnapChannel(NamedTuple):
+    """A snapshot non-category channel. Optional fields are None when absent from the JSON."""
+    id: Optional[int]
+    name: str
+    type: str
+    position: Optional[int]
+    parent_id: Optional[int]
+    overwrites: Dict[str, dict]
+    topic: Optional[str]
+    nsfw: Optional[bool]
+    slowmode_delay: Optional[int]
+
+
+def _opt_int(value) -> Optional[int]:
+    """int(value), keeping None as "absent"."""
+    return None if value is None else int(value)
+
+
+def _opt_bool(value) -> Optional[bool]:
+    """bool(value), keeping None as "absent"."""
+    return None if value is None else bool(value)
+
+
+def _check_overwrites(block) -> Dict[str, dict]:
+    """
+    Validate a snapshot overwrite block: {subject_key: {"allow": int, "deny": int}} or
+    {subject_key: {permission_name: True/False/None}}. Returns it ({} if absent).
+    Raises TypeError on any other shape, ValueError on a role key whose id is not decimal.
+    """
+    if block is None:
+        return {}
+    if not isinstance(block, dict):
+        raise TypeError(f"overwrites must be an object, not {type(block).__name__}")
+    for key, perms in block.items():
+        split = _split_overwrite_key(key)
+        if split is not None and split[0] == "role" and not split[1].isdecimal():
+            raise ValueError(f"overwrite {key!r}: role id must be a decimal number")
+        if not isinstance(perms, dict):
+            raise TypeError(f"overwrite {key!r} must be an object, not {type(perms).__name__}")
+        if set(perms) == {"allow", "deny"}:
+            if not (isinstance(perms["allow"], int) and isinstance(perms["deny"], int)):
+                raise TypeError(f"overwrite {key!r}: allow/deny must be integers")
+        elif not all(v is None or isinstance(v, bool) for v in perms.values()):
+            raise TypeError(f"overwrite {key!r}: permission values must be true, false or null")
+    return block
+
+
+def _parse_snapshot(data: dict) -> Tuple[List[SnapRole], List[SnapCategory], List[SnapChannel]]:
+    """
+    Normalize a decoded snapshot into typed records once, so the preview and apply steps read
+    attributes instead of repeating .get() ladders and type guards.
+    Entries without a name are dropped (nothing can be matched without one).
+    Raises ValueError/TypeError/AttributeError on malformed values, including overwrite
+    blocks (see _check_overwrites), so nothing later has to re-validate them.
+    """
+    roles = [
+        SnapRole(
+            id=r["id"] if isinstance(r.get("id"), int) else None,
+            name=r["name"],
+            position=_opt_int(r.get("position")),
+            color=_opt_int(r.get("color")),
+            hoist=_opt_bool(r.get("hoist")),
+            mentionable=_opt_bool(r.get("mentionable")),
+            permissions=_opt_int(r.get("permissions")),
+        )
+        for r in data.get("roles") or ()
+        if isinstance(r, dict) and isinstance(r.get("name"), str) and r["name"]
+    ]
+    categories = [
+        SnapCategory(
+            id=c["id"] if isinstance(c.get("id"), int) else None,
+            name=c["name"],
+            overwrites=_check_overwrites(c.get("overwrites")),
+        )
+        for c in data.get("categories") or ()
+        if isinstance(c, dict) and isinstance(c.get("name"), str) and c["name"]
+    ]
+    channels = [
+        SnapChannel(
+            id=ch["id"] if isinstance(ch.get("id"), int) else None,
+            name=ch["name"],
+            type=ch.get("type") or "text",
+            position=_opt_int(ch.get("position")),
+            parent_id=_opt_int(ch.get("parent_id")),
+            overwrites=_check_overwrites(ch.get("overwrites")),
+            topic=ch.get("topic"),
+            nsfw=_opt_bool(ch.get("nsfw")),
+            slowmode_delay=_opt_int(ch.get("slowmode_delay")),
+        )
+        for ch in data.get("channels") or ()
+        if isinstance(ch, dict) and isinstance(ch.get("name"), str) and ch["name"]
+    ]
+    return roles, categories, channels
+
+
 def _perm_overwrites_from_json(
     guild: discord.Guild,
-    overwrites_json: Dict[str, Dict[str, Optional[bool]]],
+    overwrites_json: Dict[str, dict],
+    roles_by_name: Dict[str, discord.Role],
     snapshot_roles_by_id: Optional[Dict[int, str]] = None,
 ) -> Dict[discord.abc.Snowflake, discord.PermissionOverwrite]:
     """
     Convert snapshot overwrite schema to a mapping usable by Channel/Category .edit(overwrites=...).
 
-    Keys look like "role:<id>" or "member:<id>" (members are intentionally skipped in v1).
+    Keys look like "r<id>"/"u<id>" or "role:<id>"/"member:<id>" (members are intentionally skipped in v1).
+    Values may use either overwrite layout (see _overwrite_from_json).
     Strategy:
       1) Try matching role by ID in the current guild.
-      2) If not found and we have a snapshot id->name table, try matching by NAME.
-      3) Special-case @everyone (role id == guild.id).
+      2) Special-case @everyone (role id == guild.id).
+      3) If not found and we have a snapshot id->name table, try matching by NAME (via `roles_by_name`).
     """
     result = {}
     if not overwrites_json:
         return result
 
+    # Loop-invariant lookups, hoisted out of the per-subject loop.
+    get_role = guild.get_role
+    guild_id = guild.id
     for subject_key, perms_dict in overwrites_json.items():
-        try:
-            subject_type, raw_id = subject_key.split(":")
-        except ValueError:
+        split = _split_overwrite_key(subject_key)
+        if split is None:
             continue
+        subject_type, raw_id = split
 
         if subject_type != "role":
             # We don't apply member-specific overwrites cross-server in v1.
             continue
 
-        role: Optional[discord.Role] = None
-        # 1) Try ID
-        try:
-            rid = int(raw_id)
-            role = guild.get_role(rid)
-        except ValueError:
-            role = None
+        # Parse the id once; isdecimal() matches exactly what int() accepts here.
+        if not raw_id.isdecimal():
+            continue
+        rid = int(raw_id)
 
-        # 2) Special-case @everyone
-        if role is None and raw_id == str(guild.id):
+        # 1) ID in this guild, 2) @everyone, 3) NAME via the snapshot table
+        role: Optional[discord.Role] = get_role(rid)
+        if role is None and rid == guild_id:
             role = guild.default_role
-
-        # 3) Fallback by NAME using snapshot table
         if role is None and snapshot_roles_by_id:
-            try:
-                rid = int(raw_id)
-                snap_name = snapshot_roles_by_id.get(rid)
-                if snap_name:
-                    role = discord.utils.get(guild.roles, name=snap_name)
-            except ValueError:
-                pass
+            snap_name = snapshot_roles_by_id.get(rid)
+            if snap_name:
+                role = roles_by_name.get(snap_name)
 
         if role is None:
             # Skip unknown roles; safer than guessing.
             continue
 
-        po = discord.PermissionOverwrite()
-        for attr, val in (perms_dict or {}).items():
-            if hasattr(po, attr):
-                setattr(po, attr, val)
-        result[role] = po
+        result[role] = _overwrite_from_json(perms_dict)
 
     return result
 
 
+def _overwrites_json_key(overwrites_json: Dict[str, dict]) -> Tuple:
+    """Canonical hashable form of a snapshot overwrite block (order-insensitive), for memoizing."""
+    return tuple(sorted((k, tuple(sorted((v or {}).items()))) for k, v in overwrites_json.items()))
+
+
+def _reaction_check(msg_id: int, author_id: int, reaction: discord.Reaction, user: discord.User) -> bool:
+    """wait_for("reaction_add") predicate: a confirm/cancel reaction by `author_id` on `msg_id`."""
+    return reaction.message.id == msg_id and user.id == author_id and str(reaction.emoji) in _REACTIONS
+
+
+async def _gather_bounded(aws: Iterable[Awaitable], limit: int = APPLY_CONCURRENCY) -> List[object]:
+    """
+    Await `aws` concurrently, at most `limit` at a time, and return their results in order.
+    Exceptions are returned in place of results (like asyncio.gather(return_exceptions=True)).
+    """
+    sem = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable):
+        async with sem:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=True)
+
+
+def _tally(results: Dict[str, int], outcomes: Iterable[object]) -> None:
+    """Count apply outcomes into `results`: a key is incremented, an exception counts as an error."""
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            results["errors"] += 1
+        elif outcome:
+            results[outcome] += 1
+
+
 def _collect_current_named(
     guild: discord.Guild,
 ) -> Tuple[Dict[str, discord.Role], Dict[str, discord.CategoryChannel], Dict[str, discord.abc.GuildChannel]]:
+    """
+    Name -> object maps for the guild's roles, categories and text/voice/forum channels.
+    Categories and channels are classified in one pass over guild.channels (which, unlike
+    guild.categories, is not re-sorted on every access), by ChannelType set lookup rather
+    than isinstance checks.
+    """
     roles_by_name = {r.name: r for r in guild.roles}
-    cats_by_name = {c.name: c for c in guild.categories}
-    chans_by_name = {
-        c.name: c for c in guild.channels if isinstance(c, (discord.TextChannel, discord.VoiceChannel, discord.ForumChannel))
-    }
+    cats_by_name: Dict[str, discord.CategoryChannel] = {}
+    chans_by_name: Dict[str, discord.abc.GuildChannel] = {}
+    for c in guild.channels:
+        t = c.type
+        if t is _CATEGORY_TYPE:
+            cats_by_name[c.name] = c
+        elif t in _APPLY_CHANNEL_TYPES:
+            chans_by_name[c.name] = c
     return roles_by_name, cats_by_name, chans_by_name
 
 
+class ChangePlan(NamedTuple):
+    """What update_from_json will change; built once for the preview and reused by the apply step."""
+    role_creates: List[SnapRole]  # missing from the guild (last snapshot entry per name)
+    role_edits: List[Tuple[SnapRole, discord.Role]]  # color/hoist/mentionable differ
+    role_updates: List[str]  # any role diff incl. permissions (preview only)
+    role_deletes: List[discord.Role]  # unmanaged roles absent from the snapshot
+    cat_creates: List[str]
+    chan_creates: List[str]
+    chan_updates: List[str]  # parent, position or role overwrites differ
+
+
+def _build_change_plan(
+    snap_roles: List[SnapRole],
+    snap_categories: List[SnapCategory],
+    snap_channels: List[SnapChannel],
+    roles_by_name: Dict[str, discord.Role],
+    cats_by_name: Dict[str, discord.CategoryChannel],
+    chans_by_name: Dict[str, discord.abc.GuildChannel],
+) -> ChangePlan:
+    """
+    Diff the snapshot against the guild's current objects in one pass per section.
+    Channel creates/updates are listed by name only: their overwrites and parents are resolved
+    at apply time, once the roles and categories they reference exist.
+    """
+    role_creates: List[SnapRole] = []
+    role_edits: List[Tuple[SnapRole, discord.Role]] = []
+    role_updates: List[str] = []
+    # Duplicate names collapse to the last entry.
+    role_items = {r.name: r for r in snap_roles if r.name != "@everyone"}
+    for name, r in role_items.items():
+        cur = roles_by_name.get(name)
+        if cur is None:
+            role_creates.append(r)
+            continue
+        cur_sig = (cur.color.value, cur.hoist, cur.mentionable, cur.permissions.value)
+        # Fields absent from the snapshot (None) keep the current value.
+        snap_sig = tuple(
+            c if v is None else v
+            for c, v in zip(cur_sig, (r.color, r.hoist, r.mentionable, r.permissions))
+        )
+        if cur_sig != snap_sig:
+            role_updates.append(name)
+            if cur_sig[:3] != snap_sig[:3]:
+                role_edits.append((r, cur))
+
+    # Iterate roles_by_name (not a set difference) so the preview and deletion order follow the guild.
+    role_deletes = [
+        r for n, r in roles_by_name.items() if n not in role_items and n != "@everyone" and not r.managed
+    ]
+
+    # Ordered (for the preview text) and de-duplicated.
+    snap_cat_names = dict.fromkeys(c.name for c in snap_categories)
+    snap_chan_names = dict.fromkeys(ch.name for ch in snap_channels)
+    cat_creates = [n for n in snap_cat_names if n not in cats_by_name]
+    chan_creates = [n for n in snap_chan_names if n not in chans_by_name]
+
+    chan_updates: List[str] = []
+    # Live (signature, has non-role entries) by channel id: snapshot entries sharing a name hit
+    # the same channel.
+    live_sigs: Dict[int, Tuple[FrozenSet[Tuple[int, int, int]], bool]] = {}
+    for ch in snap_channels:
+        name = ch.name
+        cur = chans_by_name.get(name)
+        if cur:
+            live = live_sigs.get(cur.id)
+            if live is None:
+                live = live_sigs[cur.id] = (
+                    _role_overwrite_sig(cur.overwrites),
+                    any(not isinstance(target, discord.Role) for target in cur.overwrites),
+                )
+            current_sig, has_member_entries = live
+            snapshot_sig = _snapshot_overwrite_sig(ch.overwrites)
+            logger.debug(f"Channel {name}: Current overwrites: {current_sig}, Snapshot overwrites: {snapshot_sig}")
+            if (
+                (ch.position is not None and cur.position != ch.position)
+                or cur.category_id != ch.parent_id
+                or current_sig != snapshot_sig
+                # Applying role overwrites replaces the whole mapping, dropping member entries.
+                or (snapshot_sig and has_member_entries)
+            ):
+                chan_updates.append(name)
+
+    return ChangePlan(role_creates, role_edits, role_updates, role_deletes, cat_creates, chan_creates, chan_updates)
+
+
 def _role_position_plan(
-    snapshot_roles: List[dict],
+    snapshot_roles: List[SnapRole],
     guild: discord.Guild,
     roles_by_name: Dict[str, discord.Role],
-) -> List[Tuple[discord.Role, int]]:
+) -> Dict[discord.Role, int]:
     """
-    Compute desired role positions.
+    Compute desired role positions as a {role: position} mapping for edit_role_positions.
     Snapshot includes 'position' (Discord-style integer). We'll attempt to honor it by matching role names.
     """
-    plan = []
-    snap_sorted = sorted(snapshot_roles, key=lambda r: r.get("position", 0))
-    for snap in snap_sorted:
-        name = snap.get("name")
-        if not name:
-            continue
-        role = roles_by_name.get(name)
-        if role:
-            plan.append((role, snap.get("position", role.position)))
-    return plan
+    # Entries without a position would only "move" a role to where it already is, so drop
+    # them up front; that also lets the sort use a C-level attrgetter key.
+    # Sorting keeps the previous tie-break: for duplicate names the highest position wins.
+    snap_sorted = sorted((r for r in snapshot_roles if r.position is not None), key=attrgetter("position"))
+    return {roles_by_name[s.name]: s.position for s in snap_sorted if s.name in roles_by_name}
 
 
 def _resolve_parent_category(
-    snap_ch: dict,
+    snap_ch: SnapChannel,
     cats_by_name: Dict[str, discord.CategoryChannel],
     snapshot_categories_by_id: Dict[int, str],
+    cats_by_id: Dict[int, discord.CategoryChannel],
 ) -> Optional[discord.CategoryChannel]:
     """
     Resolve the correct CategoryChannel object in the current guild for a snapshot channel.
     Prefer mapping parent_id->snapshot_name, then find that name in current guild.
+    If the snapshot has no category record for parent_id, fall back to a live category with
+    that id (same-guild restores).
     """
-    parent_id = snap_ch.get("parent_id")
-    if not parent_id:
-        return None
-    try:
-        pid = int(parent_id)
-    except Exception:
+    if not snap_ch.parent_id:
         return None
-    snap_cat_name = snapshot_categories_by_id.get(pid)
+    snap_cat_name = snapshot_categories_by_id.get(snap_ch.parent_id)
     if not snap_cat_name:
-        return None
+        return cats_by_id.get(snap_ch.parent_id)
     return cats_by_name.get(snap_cat_name)
 
 
@@ -182,6 +831,10 @@ class UpdateFromJSON(commands.Cog):
 
     def __init__(self, bot: Red):
         self.bot = bot
+        # Snapshot directories already created by this process (skip mkdir on later runs).
+        self._ensured_dirs: Set[Path] = set()
+        # One update_from_json apply at a time per guild (guild id -> lock).
+        self._apply_locks: Dict[int, asyncio.Lock] = {}
 
     # ---------- GROUP ----------
 
@@ -195,101 +848,60 @@ class UpdateFromJSON(commands.Cog):
 
     @mihsef_group.command(name="snapshot")
     @checks.admin_or_permissions(manage_guild=True)
-    async def snapshot_now(self, ctx: commands.Context):
+    async def snapshot_now(self, ctx: commands.Context, readable: bool = False):
         """
         Snapshot the current guild (roles/categories/channels/overwrites) to a JSON file,
         save it in /data/mihsef_snapshots and upload it.
+        Pass `True` to store overwrites as named permissions instead of compact bitfields.
         """
         guild = ctx.guild
-        data = {
-            "meta": {
-                "guild_id": guild.id,
-                "guild_name": guild.name,
-                "snapshot_at": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
-                "owner_id": guild.owner_id,
-            },
-            "roles": [],
-            "categories": [],
-            "channels": [],
+        meta = {
+            "schema_version": SCHEMA_NAMED if readable else SCHEMA_SHORT_KEYS,
+            "guild_id": guild.id,
+            "guild_name": guild.name,
+            "snapshot_at": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "owner_id": guild.owner_id,
         }
+        # Build the plain records here, on the event loop: discord.py models are mutated by the
+        # gateway on the loop and are not safe to read from a worker thread. Only encoding and
+        # disk I/O are handed to the executor below.
+        roles = guild.roles
+        target_keys = {r.id: _overwrite_key(r, readable) for r in roles}
+        perms_cache: Dict[Tuple[int, int], dict] = {}
+
+        sections = [
+            ("meta", meta),
+            ("roles", [_role_dict(r) for r in roles]),
+            ("categories", [_category_dict(c, target_keys, perms_cache, readable) for c in guild.categories]),
+            # Channels (text/voice/forum)
+            ("channels", [
+                _channel_dict(ch, target_keys, perms_cache, readable)
+                for ch in guild.channels
+                if ch.type is not _CATEGORY_TYPE
+            ]),
+        ]
 
-        # Roles
-        for r in guild.roles:
-            data["roles"].append({
-                "id": r.id,
-                "name": r.name,
-                "position": r.position,
-                "color": r.color.value,
-                "hoist": r.hoist,
-                "mentionable": r.mentionable,
-                "managed": r.managed,
-                "permissions": r.permissions.value,
-            })
-
-        # Categories
-        for c in guild.categories:
-            overwrites = {}
-            for target, perms in c.overwrites.items():
-                key = f"role:{target.id}" if isinstance(target, discord.Role) else f"member:{target.id}"
-                overwrites[key] = _overwrite_to_dict(perms)
-            data["categories"].append({
-                "id": c.id,
-                "name": c.name,
-                "position": c.position,
-                "nsfw": getattr(c, "nsfw", False) or getattr(c, "is_nsfw", lambda: False)(),
-                "overwrites": overwrites,
-            })
-
-        # Channels (text/voice/forum)
-        for ch in guild.channels:
-            if isinstance(ch, discord.CategoryChannel):
-                continue
-            overwrites = {}
-            for target, perms in ch.overwrites.items():
-                key = f"role:{target.id}" if isinstance(target, discord.Role) else f"member:{target.id}"
-                overwrites[key] = _overwrite_to_dict(perms)
-
-            if isinstance(ch, discord.VoiceChannel):
-                ch_type = "voice"
-                topic = None
-                nsfw = False
-                slowmode = 0
-            elif isinstance(ch, discord.ForumChannel):
-                ch_type = "forum"
-                topic = getattr(ch, "topic", None)
-                nsfw = getattr(ch, "nsfw", False)
-                slowmode = getattr(ch, "slowmode_delay", 0)
-            else:
-                ch_type = "text"
-                topic = getattr(ch, "topic", None)
-                nsfw = getattr(ch, "nsfw", False)
-                slowmode = getattr(ch, "slowmode_delay", 0)
-
-            data["channels"].append({
-                "id": ch.id,
-                "name": ch.name,
-                "type": ch_type,
-                "position": ch.position,
-                "parent_id": ch.category_id,
-                "overwrites": overwrites,
-                "nsfw": nsfw,
-                "slowmode_delay": slowmode,
-                "topic": topic,
-            })
-
-        # Save & upload
+        # Save & upload (serialization and disk I/O run off the event loop)
         outdir = Path("/data/mihsef_snapshots")
-        outdir.mkdir(parents=True, exist_ok=True)
-        filename = f"{guild.name.replace(' ', '_')}_snapshot_{datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S')}Z.json"
+        g = time.gmtime()
+        stamp = f"{g.tm_year:04d}{g.tm_mon:02d}{g.tm_mday:02d}T{g.tm_hour:02d}{g.tm_min:02d}{g.tm_sec:02d}Z"
+        filename = f"{guild.name.replace(' ', '_')}_snapshot_{stamp}.json.gz"
         filepath = outdir / filename
 
-        with filepath.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        # The typing indicator is kept alive in the background for the whole write + upload.
+        async with ctx.typing():
+            loop = asyncio.get_running_loop()
+            ensure_dir = outdir not in self._ensured_dirs
+            payload = await loop.run_in_executor(None, _write_snapshot, filepath, sections, ensure_dir)
+            self._ensured_dirs.add(outdir)
 
-        try:
-            await ctx.send(f"Snapshot saved: `{filename}`", file=discord.File(str(filepath)))
-        except Exception:
-            await ctx.send(f"Snapshot saved to `{filepath}` (upload failed).")
+            try:
+                await ctx.send(
+                    f"Snapshot saved: `{filename}`",
+                    file=discord.File(io.BytesIO(payload), filename=filename),
+                )
+            except Exception:
+                await ctx.send(f"Snapshot saved to `{filepath}` (upload failed).")
 
     # ---------- UPDATE FROM JSON ----------
 
@@ -297,123 +909,82 @@ class UpdateFromJSON(commands.Cog):
     @checks.admin_or_permissions(manage_guild=True)
     async def update_from_json_cmd(self, ctx: commands.Context):
         """
-        Use with a JSON snapshot attached.
+        Use with a JSON snapshot attached (.json or gzip-compressed .json.gz).
         Flow: parse -> preview summary -> add ✅/❌ -> on ✅ apply changes -> final summary.
         """
         if not ctx.message.attachments:
             return await ctx.send("Please attach a JSON snapshot file to this command.")
 
         att = ctx.message.attachments[0]
-        if not att.filename.lower().endswith(".json"):
-            return await ctx.send("The attachment must be a .json file.")
+        att_name = att.filename.lower()
+        if not att_name.endswith((".json", ".json.gz")):
+            return await ctx.send("The attachment must be a .json or .json.gz file.")
 
         raw = await att.read()
         try:
-            data = json.loads(raw.decode("utf-8"))
+            if att_name.endswith(".gz"):
+                raw = await asyncio.get_running_loop().run_in_executor(None, _gunzip_capped, raw)
+            data = _loads_json(raw)
         except Exception as e:
             return await ctx.send(f"Could not parse JSON: `{e}`")
+        # Only the parsed records are needed from here on; don't keep the raw bytes (or the
+        # generic dicts) alive for the whole preview/confirm/apply run.
+        del raw
+        try:
+            snap_roles, snap_categories, snap_channels = _parse_snapshot(data)
+        except (AttributeError, TypeError, ValueError) as e:
+            return await ctx.send(f"Malformed snapshot: `{e}`")
+        del data
 
         guild: discord.Guild = ctx.guild
 
-        snap_roles: List[dict] = data.get("roles", [])
-        snap_categories: List[dict] = data.get("categories", [])
-        snap_channels: List[dict] = data.get("channels", [])
-
-        snapshot_roles_by_id = {}
-        for r in snap_roles:
-            rid = r.get("id")
-            name = r.get("name")
-            if isinstance(rid, int) and isinstance(name, str):
-                snapshot_roles_by_id[rid] = name
-
-        snapshot_categories_by_id = {}
-        for c in snap_categories:
-            cid = c.get("id")
-            name = c.get("name")
-            if isinstance(cid, int) and isinstance(name, str):
-                snapshot_categories_by_id[cid] = name
+        snapshot_roles_by_id = {r.id: r.name for r in snap_roles if r.id is not None}
+        snapshot_categories_by_id = {c.id: c.name for c in snap_categories if c.id is not None}
 
         roles_by_name, cats_by_name, chans_by_name = _collect_current_named(guild)
 
         # ------- Build preview -------
-        creates_roles, updates_roles = [], []
-        for r in snap_roles:
-            name = r.get("name")
-            if not name or name == "@everyone":
-                continue
-            cur = roles_by_name.get(name)
-            if cur is None:
-                creates_roles.append(name)
-            elif (
-                cur.color.value != r.get("color", cur.color.value)
-                or cur.hoist != r.get("hoist", cur.hoist)
-                or cur.mentionable != r.get("mentionable", cur.mentionable)
-                or cur.permissions.value != r.get("permissions", cur.permissions.value)
-            ):
-                updates_roles.append(name)
-
-        creates_cats = [c["name"] for c in snap_categories if c.get("name") not in cats_by_name]
-        creates_chans = [ch["name"] for ch in snap_channels if ch.get("name") not in chans_by_name]
-        overwrite_updates = []
-        for ch in snap_channels:
-            name = ch.get("name")
-            if not name:
-                continue
-            cur = chans_by_name.get(name)
-            if cur:
-                current_overwrites = {}
-                for target, perms in cur.overwrites.items():
-                    if isinstance(target, discord.Role):
-                        current_overwrites[f"role:{target.id}"] = _overwrite_to_dict(perms)
-                snapshot_overwrites = ch.get("overwrites", {})
-                logger.debug(f"Channel {name}: Current overwrites: {current_overwrites}, Snapshot overwrites: {snapshot_overwrites}")
-                if (
-                    cur.position != ch.get("position", cur.position)
-                    or cur.category_id != ch.get("parent_id")
-                    or current_overwrites != snapshot_overwrites
-                ):
-                    overwrite_updates.append(name)
+        plan = _build_change_plan(snap_roles, snap_categories, snap_channels, roles_by_name, cats_by_name, chans_by_name)
+        if not any(plan):
+            # Nothing to confirm or apply: no reaction prompt, no wait.
+            return await ctx.send(
+                embed=discord.Embed(
+                    title="Update From JSON — Preview",
+                    description="No changes detected (based on name and attributes).",
+                    color=discord.Color.blurple(),
+                )
+            )
 
         desc_lines = []
-        if creates_roles:
-            desc_lines.append(f"**Create Roles:** {', '.join(creates_roles)}")
-        if updates_roles:
-            desc_lines.append(f"**Update Roles:** {', '.join(updates_roles)}")
-        if creates_cats:
-            desc_lines.append(f"**Create Categories:** {', '.join(creates_cats)}")
-        if creates_chans:
-            desc_lines.append(f"**Create Channels:** {', '.join(creates_chans)}")
-        if overwrite_updates:
-            head = ", ".join(overwrite_updates[:50])  # Increased limit to 50
-            tail = " …" if len(overwrite_updates) > 50 else ""
+        if plan.role_creates:
+            desc_lines.append(f"**Create Roles:** {', '.join(r.name for r in plan.role_creates)}")
+        if plan.role_updates:
+            desc_lines.append(f"**Update Roles:** {', '.join(plan.role_updates)}")
+        if plan.role_deletes:
+            desc_lines.append(f"**Delete Roles:** {', '.join(r.name for r in plan.role_deletes)}")
+        if plan.cat_creates:
+            desc_lines.append(f"**Create Categories:** {', '.join(plan.cat_creates)}")
+        if plan.chan_creates:
+            desc_lines.append(f"**Create Channels:** {', '.join(plan.chan_creates)}")
+        if plan.chan_updates:
+            head = ", ".join(plan.chan_updates[:50])  # Increased limit to 50
+            tail = " …" if len(plan.chan_updates) > 50 else ""
             desc_lines.append(f"**Update Overwrites/Props (channels):** {head}{tail}")
-        if not desc_lines:
-            desc_lines.append("No changes detected (based on name and attributes).")
 
         preview = discord.Embed(
             title="Update From JSON — Preview",
             description="\n".join(desc_lines),
             color=discord.Color.blurple(),
         )
-        if desc_lines[0] != "No changes detected (based on name and attributes).":
-            preview.set_footer(text="React ✅ to apply, ❌ to cancel (invoker only).")
-            msg = await ctx.send(embed=preview)
-            for r in (CHECK_MARK, CROSS_MARK):
-                try:
-                    await msg.add_reaction(r)
-                except discord.HTTPException:
-                    pass
-        else:
-            await ctx.send(embed=preview)
-            return  # Exit early if no changes
-
-        def check(reaction: discord.Reaction, user: discord.User):
-            return (
-                reaction.message.id == msg.id
-                and str(reaction.emoji) in (CHECK_MARK, CROSS_MARK)
-                and user.id == ctx.author.id
-            )
+        preview.set_footer(text="React ✅ to apply, ❌ to cancel (invoker only).")
+        msg = await ctx.send(embed=preview)
+        for r in (CHECK_MARK, CROSS_MARK):
+            try:
+                await msg.add_reaction(r)
+            except discord.HTTPException:
+                pass
 
+        check = functools.partial(_reaction_check, msg.id, ctx.author.id)
         try:
             reaction, _ = await self.bot.wait_for("reaction_add", timeout=180.0, check=check)
         except asyncio.TimeoutError:
@@ -434,177 +1005,218 @@ class UpdateFromJSON(commands.Cog):
             "errors": 0,
         }
 
-        # 1) Roles (create/update basic props)
-        try:
-            for r in snap_roles:
-                name = r.get("name")
-                if not name or name == "@everyone":
-                    continue
-
-                role = roles_by_name.get(name)
-                if role is None:
-                    role = await guild.create_role(
-                        name=name,
-                        colour=discord.Colour(r.get("color", 0)),
-                        hoist=r.get("hoist", False),
-                        mentionable=r.get("mentionable", False),
-                        reason="MiHSEF update_from_json: create role",
+        # Independent API calls within each phase run concurrently (see _gather_bounded);
+        # phases stay in order because later ones depend on objects created earlier.
+        # Each helper returns the `results` key to increment (or None); exceptions count as errors.
+
+        # discord.py already sleeps and retries 429s and 5xx responses inside its HTTP client; an
+        # edit/delete that still ends in a DiscordServerError is parked here by attempt() and re-run
+        # once at the end of its phase by retry_deferred(). Anything else (e.g. 400/403) is final.
+        # Creates never go through attempt(): the first request may have succeeded server-side,
+        # and re-sending it would create a duplicate.
+        deferred: List[Callable[[], Awaitable]] = []
+
+        async def attempt(op: Callable[[], Awaitable]) -> object:
+            try:
+                return await op()
+            except discord.DiscordServerError:
+                deferred.append(op)
+                return None
+
+        async def retry_deferred() -> None:
+            # A second failure is final and counts as an error.
+            ops = deferred[:]
+            deferred.clear()
+            _tally(results, await _gather_bounded(op() for op in ops))
+
+        async def create_role(r: SnapRole) -> str:
+            roles_by_name[r.name] = await guild.create_role(
+                name=r.name,
+                colour=discord.Colour(r.color or 0),
+                hoist=bool(r.hoist),
+                mentionable=bool(r.mentionable),
+                reason="MiHSEF update_from_json: create role",
+            )
+            return "roles_created"
+
+        async def edit_role(r: SnapRole, role: discord.Role) -> str:
+            await role.edit(
+                colour=discord.Colour(role.color.value if r.color is None else r.color),
+                hoist=role.hoist if r.hoist is None else r.hoist,
+                mentionable=role.mentionable if r.mentionable is None else r.mentionable,
+                reason="MiHSEF update_from_json: update role",
+            )
+            return "roles_updated"
+
+        async def delete_role(role: discord.Role) -> str:
+            try:
+                await role.delete(reason="MiHSEF update_from_json: remove unused role")
+            except discord.NotFound:
+                pass  # already gone (e.g. a retried delete whose first attempt went through)
+            return "roles_deleted"
+
+        async def create_category(name: str) -> str:
+            cats_by_name[name] = await guild.create_category(
+                name=name, reason="MiHSEF update_from_json: create category"
+            )
+            return "categories_created"
+
+        async def create_categories(names: Iterable[str]) -> List[object]:
+            # Sequential: categories are not re-positioned, so creation order is their order.
+            outcomes: List[object] = []
+            for name in names:
+                try:
+                    outcomes.append(await create_category(name))
+                except Exception as e:
+                    outcomes.append(e)
+            return outcomes
+
+        # Resolved overwrites per distinct snapshot block. Channels often share a pattern, and
+        # roles_by_name no longer changes once the role phase is done. Resolved dicts are
+        # shared between channels and must not be mutated.
+        overwrite_cache: Dict[Tuple, Dict[discord.abc.Snowflake, discord.PermissionOverwrite]] = {}
+
+        def resolve_overwrites(overwrites_json: Dict[str, dict]):
+            key = _overwrites_json_key(overwrites_json)
+            resolved = overwrite_cache.get(key)
+            if resolved is None:
+                resolved = overwrite_cache[key] = _perm_overwrites_from_json(
+                    guild, overwrites_json, roles_by_name, snapshot_roles_by_id
+                )
+            return resolved
+
+        async def sync_category_overwrites(cat: discord.CategoryChannel, overwrites_json: Dict[str, dict]) -> None:
+            # Resolution runs inside the op, so a failure counts as an error instead of aborting the apply.
+            overwrites = resolve_overwrites(overwrites_json)
+            # Skip no-op edits: each one still costs a request and a rate-limit slot.
+            if overwrites and not _overwrites_in_sync(overwrites, cat.overwrites):
+                await cat.edit(overwrites=overwrites, reason="MiHSEF: category overwrites")
+
+        async def apply_channel(ch: SnapChannel, parent_obj: Optional[discord.CategoryChannel]) -> Optional[str]:
+            # Create or update one channel (a single request either way); returns the outcome key.
+            name = ch.name
+            ch_type = ch.type
+            existing = chans_by_name.get(name)
+            overwrites = resolve_overwrites(ch.overwrites)
+            if existing is None:
+                # Create; overwrites and text props go in the create payload (one request per channel)
+                create_kwargs = {}
+                if overwrites:
+                    create_kwargs["overwrites"] = overwrites
+                if ch_type == "voice":
+                    created = await guild.create_voice_channel(
+                        name=name, category=parent_obj, reason="MiHSEF: create voice", **create_kwargs
+                    )
+                elif ch_type == "forum":
+                    # Basic forum create; detailed forum settings are out-of-scope in v1
+                    created = await guild.create_forum_channel(
+                        name=name, category=parent_obj, reason="MiHSEF: create forum", **create_kwargs
                     )
-                    roles_by_name[name] = role
-                    results["roles_created"] += 1
                 else:
-                    need_edit = (
-                        role.color.value != r.get("color", role.color.value)
-                        or role.hoist != r.get("hoist", role.hoist)
-                        or role.mentionable != r.get("mentionable", role.mentionable)
+                    if ch.topic is not None:
+                        create_kwargs["topic"] = ch.topic
+                    if ch.nsfw is not None:
+                        create_kwargs["nsfw"] = ch.nsfw
+                    if ch.slowmode_delay is not None:
+                        create_kwargs["slowmode_delay"] = ch.slowmode_delay
+                    created = await guild.create_text_channel(
+                        name=name, category=parent_obj, reason="MiHSEF: create text", **create_kwargs
                     )
-                    if need_edit:
-                        await role.edit(
-                            colour=discord.Colour(r.get("color", role.color.value)),
-                            hoist=r.get("hoist", role.hoist),
-                            mentionable=r.get("mentionable", role.mentionable),
-                            reason="MiHSEF update_from_json: update role",
-                        )
-                        results["roles_updated"] += 1
+                chans_by_name[name] = created
+                return "channels_created"
+
+            # Update props + overwrites in a single edit
+            kwargs = {}
+            # Move into correct category if needed
+            if parent_obj and existing.category != parent_obj:
+                kwargs["category"] = parent_obj
+
+            if isinstance(existing, discord.TextChannel):
+                if ch.topic is not None and (existing.topic or "") != ch.topic:
+                    kwargs["topic"] = ch.topic
+                if ch.nsfw is not None and existing.nsfw != ch.nsfw:
+                    kwargs["nsfw"] = ch.nsfw
+                if ch.slowmode_delay is not None and existing.slowmode_delay != ch.slowmode_delay:
+                    kwargs["slowmode_delay"] = ch.slowmode_delay
+
+            if overwrites and not _overwrites_in_sync(overwrites, existing.overwrites):
+                kwargs["overwrites"] = overwrites
+
+            if not kwargs:
+                return None  # already in sync: no request, and not counted as an update
+            return await attempt(functools.partial(edit_channel, existing, kwargs))
+
+        async def edit_channel(existing: discord.abc.GuildChannel, kwargs: dict) -> str:
+            await existing.edit(**kwargs, reason="MiHSEF: channel update")
+            return "channel_updates"
+
+        async def apply_channel_group(group: List[Tuple[SnapChannel, Optional[discord.CategoryChannel]]]) -> List[object]:
+            # Channels sharing a parent are applied in snapshot order so they are created in order.
+            outcomes: List[object] = []
+            for ch, parent_obj in group:
+                try:
+                    outcomes.append(await apply_channel(ch, parent_obj))
+                except Exception as e:
+                    outcomes.append(e)
+            return outcomes
+
+        async with self._apply_locks.setdefault(guild.id, asyncio.Lock()):
+            # Re-diff under the lock: the preview's plan is stale if another apply finished (or the
+            # guild changed) while this one waited for confirmation or for the lock.
+            roles_by_name, cats_by_name, chans_by_name = _collect_current_named(guild)
+            plan = _build_change_plan(
+                snap_roles, snap_categories, snap_channels, roles_by_name, cats_by_name, chans_by_name
+            )
+
+            # 1) Roles (create/update basic props), from the plan
+            role_ops = [create_role(r) for r in plan.role_creates]
+            role_ops.extend(attempt(functools.partial(edit_role, r, role)) for r, role in plan.role_edits)
+            _tally(results, await _gather_bounded(role_ops))
+            await retry_deferred()
 
             # Role positions (best effort)
-            roles_by_name, _, _ = _collect_current_named(guild)
-            pos_plan = _role_position_plan(snap_roles, guild, roles_by_name)
-            if pos_plan:
-                mapping = {role: pos for role, pos in pos_plan}
-                try:
+            # roles_by_name already holds the roles created above; no rescan of guild.roles needed.
+            try:
+                mapping = _role_position_plan(snap_roles, guild, roles_by_name)
+                if mapping:
                     await guild.edit_role_positions(positions=mapping)
                     results["role_position_updates"] = len(mapping)
-                except Exception:
-                    # Non-fatal: managed roles or permission constraints can block some moves.
-                    pass
+            except Exception:
+                # Non-fatal: managed roles or permission constraints can block some moves.
+                pass
 
             # Delete roles not in the snapshot (skip @everyone and managed roles)
-            existing_roles = {r.name: r for r in guild.roles}
-            snapshot_role_names = {r.get("name") for r in snap_roles}
-            roles_to_delete = [r for n, r in existing_roles.items() if n not in snapshot_role_names and n != "@everyone" and not r.managed]
-            for role in roles_to_delete:
-                try:
-                    await role.delete(reason="MiHSEF update_from_json: remove unused role")
-                    results["roles_deleted"] += 1
-                except Exception:
-                    results["errors"] += 1
-
-        except Exception:
-            results["errors"] += 1
-
-        # 2) Categories (create + overwrites)
-        try:
-            for c in snap_categories:
-                name = c.get("name")
-                if not name:
-                    continue
-                if name not in cats_by_name:
-                    cat = await guild.create_category(
-                        name=name, reason="MiHSEF update_from_json: create category"
-                    )
-                    cats_by_name[name] = cat
-                    results["categories_created"] += 1
-
-            # Overwrites
-            for c in snap_categories:
-                name = c.get("name")
-                if not name:
-                    continue
-                cat = cats_by_name.get(name)
-                if not cat:
-                    continue
-                overwrites = _perm_overwrites_from_json(
-                    guild, c.get("overwrites"), snapshot_roles_by_id
-                )
-                if overwrites:
-                    try:
-                        await cat.edit(overwrites=overwrites, reason="MiHSEF: category overwrites")
-                    except Exception:
-                        results["errors"] += 1
-        except Exception:
-            results["errors"] += 1
-
-        # 3) Channels (create/update props + overwrites)
-        try:
+            _tally(results, await _gather_bounded(attempt(functools.partial(delete_role, r)) for r in plan.role_deletes))
+            await retry_deferred()
+
+            # 2) Categories (create + overwrites)
+            _tally(results, await create_categories(plan.cat_creates))
+            await retry_deferred()
+
+            cat_edits = [
+                attempt(functools.partial(sync_category_overwrites, cats_by_name[c.name], c.overwrites))
+                for c in snap_categories
+                if c.name in cats_by_name
+            ]
+            _tally(results, await _gather_bounded(cat_edits))
+            await retry_deferred()
+
+            # 3) Channels (create/update props + overwrites), concurrently across parent categories.
+            # Groups check-then-create against the shared chans_by_name, so every entry with a given
+            # name joins the group of its first occurrence: same-name channels are then handled in
+            # snapshot order by one group (create once, then update) instead of racing.
+            groups: Dict[Optional[int], List[Tuple[SnapChannel, Optional[discord.CategoryChannel]]]] = {}
+            group_of_name: Dict[str, Optional[int]] = {}
+            # Every live category by id (cats_by_name keeps one per name), plus any created above.
+            cats_by_id = {cat.id: cat for cat in guild.categories}
+            cats_by_id.update((cat.id, cat) for cat in cats_by_name.values())
             for ch in snap_channels:
-                name = ch.get("name")
-                if not name:
-                    continue
-                ch_type = ch.get("type", "text")
-                parent_obj = _resolve_parent_category(ch, cats_by_name, snapshot_categories_by_id)
-
-                existing = chans_by_name.get(name)
-                if existing is None:
-                    # Create
-                    if ch_type == "voice":
-                        created = await guild.create_voice_channel(
-                            name=name, category=parent_obj, reason="MiHSEF: create voice"
-                        )
-                    elif ch_type == "forum":
-                        # Basic forum create; detailed forum settings are out-of-scope in v1
-                        created = await guild.create_forum_channel(
-                            name=name, category=parent_obj, reason="MiHSEF: create forum"
-                        )
-                    else:
-                        created = await guild.create_text_channel(
-                            name=name, category=parent_obj, reason="MiHSEF: create text"
-                        )
-                        # text-specific props
-                        if "topic" in ch and ch["topic"] is not None:
-                            try:
-                                await created.edit(topic=ch["topic"])
-                            except Exception:
-                                pass
-                        if "nsfw" in ch:
-                            try:
-                                await created.edit(nsfw=bool(ch["nsfw"]))
-                            except Exception:
-                                pass
-                        if "slowmode_delay" in ch:
-                            try:
-                                await created.edit(slowmode_delay=int(ch["slowmode_delay"]))
-                            except Exception:
-                                pass
-                    chans_by_name[name] = created
-                    results["channels_created"] += 1
-                else:
-                    # Update props
-                    try:
-                        kwargs = {}
-                        # Move into correct category if needed
-                        if parent_obj and existing.category != parent_obj:
-                            kwargs["category"] = parent_obj
-
-                        if isinstance(existing, discord.TextChannel):
-                            topic = ch.get("topic")
-                            if topic is not None and (existing.topic or "") != (topic or ""):
-                                kwargs["topic"] = topic
-                            if "nsfw" in ch and existing.nsfw != bool(ch["nsfw"]):
-                                kwargs["nsfw"] = bool(ch["nsfw"])
-                            if "slowmode_delay" in ch and existing.slowmode_delay != int(ch["slowmode_delay"]):
-                                kwargs["slowmode_delay"] = int(ch["slowmode_delay"])
-
-                        if kwargs:
-                            await existing.edit(**kwargs, reason="MiHSEF: channel props")
-                        results["channel_updates"] += 1
-                    except Exception:
-                        results["errors"] += 1
-
-                # Overwrites
-                target = chans_by_name.get(name)
-                if target:
-                    overwrites = _perm_overwrites_from_json(
-                        guild, ch.get("overwrites"), snapshot_roles_by_id
-                    )
-                    if overwrites:
-                        try:
-                            await target.edit(overwrites=overwrites, reason="MiHSEF: channel overwrites")
-                        except Exception:
-                            results["errors"] += 1
-
-        except Exception:
-            results["errors"] += 1
+                parent_obj = _resolve_parent_category(ch, cats_by_name, snapshot_categories_by_id, cats_by_id)
+                key = group_of_name.setdefault(ch.name, parent_obj.id if parent_obj else None)
+                groups.setdefault(key, []).append((ch, parent_obj))
+            for outcome in await _gather_bounded(apply_channel_group(g) for g in groups.values()):
+                _tally(results, [outcome] if isinstance(outcome, BaseException) else outcome)
+            await retry_deferred()
 
         # ------- FINAL SUMMARY -------
         lines = [